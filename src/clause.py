@@ -5,6 +5,8 @@ This module contains the Clause class which represents a definite clause
 in propositional logic, with premises (negated literals) and a conclusion.
 """
 
+import sys
+
 
 class Clause:
     """
@@ -19,6 +21,13 @@ class Clause:
     "If NOT a AND NOT b, then c" or "¬a ∧ ¬b → c"
     """
 
+    # Slots drop the per-instance __dict__, which matters when a large
+    # knowledge base holds millions of clauses. The id/premise_ids/
+    # conclusion_id slots are assigned by KnowledgeBase when the clause
+    # is added.
+    __slots__ = ('premise_literals', 'conclusion_literal', 'premise_set',
+                 '_n_premises', '_str', 'id', 'premise_ids', 'conclusion_id')
+
     def __init__(self, premise_literals, conclusion_literal):
         """
         Initialize a clause with premise literals and a conclusion literal.
@@ -27,22 +36,31 @@ class Clause:
             premise_literals (list of str): The list of literals in the premise (without negation)
             conclusion_literal (str): The conclusion literal (without negation)
         """
-        self.premise_literals = premise_literals  # List of literals in the premise
-        self.conclusion_literal = conclusion_literal  # The conclusion literal
-        self.known_count = 0  # Number of known literals in the premise
+        # Literals are interned so repeated set/dict operations on them
+        # compare by identity and reuse the cached string hash
+        self.premise_literals = tuple(sys.intern(literal) for literal in premise_literals)
+        self.conclusion_literal = sys.intern(conclusion_literal)  # The conclusion literal
+        self.premise_set = frozenset(self.premise_literals)  # For O(1) subset/membership checks
+        self._n_premises = len(self.premise_literals)  # Cached premise count
+        self._str = None  # Cached string representation
 
     def __str__(self):
         """
         Return a string representation of the clause.
 
+        The formatted string is cached on first use, since tracing may
+        render the same clause many times.
+
         Returns:
             str: A formatted string representing the clause
         """
-        if not self.premise_literals:
-            return f"{self.conclusion_literal}"
-
-        premise_str = " ∧ ".join([f"¬{lit}" for lit in self.premise_literals])
-        return f"({premise_str}) → {self.conclusion_literal}"
+        if self._str is None:
+            if not self.premise_literals:
+                self._str = f"{self.conclusion_literal}"
+            else:
+                premise_str = " ∧ ".join([f"¬{lit}" for lit in self.premise_literals])
+                self._str = f"({premise_str}) → {self.conclusion_literal}"
+        return self._str
 
     def __repr__(self):
         """
@@ -51,20 +69,49 @@ class Clause:
         Returns:
             str: A string representation of the clause object
         """
-        return f"Clause(premise={self.premise_literals}, conclusion={self.conclusion_literal}, known_count={self.known_count})"
+        return f"Clause(premise={self.premise_literals}, conclusion={self.conclusion_literal})"
+
+    def __eq__(self, other):
+        """
+        Compare clauses by logical content.
+
+        Premise order does not affect a clause's meaning, so equality is
+        defined on the premise set and the conclusion.
+
+        Args:
+            other (Clause): The clause to compare against
+
+        Returns:
+            bool: True if both clauses have the same premises and conclusion
+        """
+        if not isinstance(other, Clause):
+            return NotImplemented
+        return (self.premise_set == other.premise_set
+                and self.conclusion_literal == other.conclusion_literal)
+
+    def __hash__(self):
+        """
+        Hash the clause by its logical content, consistent with __eq__.
+
+        Returns:
+            int: Hash of the premise set and conclusion
+        """
+        return hash((self.premise_set, self.conclusion_literal))
 
-    def increment_known_count(self):
+    def is_satisfied_by(self, facts):
         """
-        Increment the count of known literals in the premise.
+        Check whether every premise of this clause is in the given facts.
 
-        This is used by the forward chaining algorithm to track
-        how many premises of a clause are known to be true.
+        Delegates to frozenset.issubset, a single C-level call, instead of
+        a Python-level loop over the premises.
+
+        Args:
+            facts (set): The set of symbols known to be true
 
         Returns:
-            bool: True if all premise literals are now known, False otherwise
+            bool: True if all premises are satisfied, False otherwise
         """
-        self.known_count += 1
-        return self.known_count >= len(self.premise_literals)
+        return self.premise_set.issubset(facts)
 
     @property
     def is_fact(self):
@@ -76,16 +123,21 @@ class Clause:
         Returns:
             bool: True if the clause is a fact, False otherwise
         """
-        return len(self.premise_literals) == 0
+        return self._n_premises == 0
 
     @classmethod
     def from_string(cls, clause_str):
         """
         Create a Clause object from a string representation.
 
+        The conclusion may appear anywhere on the line: premises are the
+        '-' tokens wherever they occur, matching how the bulk loaders
+        tokenize the data files (which are conclusion-first, e.g. "a -b -c").
+
         Args:
-            clause_str (str): A string in the format "-a -b c" or "c" where -a and -b are
-                              premise literals and c is the conclusion
+            clause_str (str): A string in the format "-a -b c", "a -b -c",
+                              or "c" where -a and -b are premise literals
+                              and the positive literal is the conclusion
 
         Returns:
             Clause: A new Clause object representing the given string
@@ -95,26 +147,14 @@ class Clause:
         """
         literals = clause_str.strip().split()
 
-        # Separate premises and conclusion
-        premise_literals = []
-        conclusion_literal = None
-
-        for literal in literals:
-            if literal.startswith('-'):
-                # This is a negated literal (premise)
-                premise_literals.append(literal[1:])  # Remove the negation for storage
-            else:
-                # This is a positive literal (conclusion)
-                conclusion_literal = literal
-                break
+        # Premises are the negated tokens anywhere on the line; the
+        # conclusion is the first positive token
+        premise_literals = [literal[1:] for literal in literals if literal.startswith('-')]
+        conclusion_literal = next(
+            (literal for literal in literals if not literal.startswith('-')), None)
 
         # Validate that we have a conclusion
         if conclusion_literal is None and literals:
-            # Special case: if there's just one literal and it's positive, it's a fact
-            if len(literals) == 1 and not literals[0].startswith('-'):
-                conclusion_literal = literals[0]
-                premise_literals = []
-            else:
-                raise ValueError("Definite clause must have exactly one positive literal (conclusion)")
+            raise ValueError("Definite clause must have exactly one positive literal (conclusion)")
 
         return cls(premise_literals, conclusion_literal)
\ No newline at end of file
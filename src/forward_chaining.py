@@ -5,7 +5,90 @@ This module contains the implementation of the PL-FC-ENTAILS? algorithm
 as described in the project specification.
 """
 
-from collections import defaultdict, deque
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional: without it the pure-Python loop below is used
+    njit = None
+
+
+def _fc_core(offsets, clause_ids, conclusions, premise_counts, facts, query_id, n_symbols):
+    """
+    Core BFS loop of forward chaining over CSR-encoded clause arrays.
+
+    This function does pure integer work on flat arrays so it can be
+    JIT-compiled by Numba when available. Symbols are deduplicated at
+    enqueue time, so a fixed buffer of n_symbols slots suffices for the
+    agenda and each symbol is visited at most once.
+
+    Args:
+        offsets (np.int32): CSR offsets per symbol id (see KnowledgeBase.to_csr)
+        clause_ids (np.int32): CSR clause ids grouped by premise symbol
+        conclusions (np.int32): Conclusion id per clause
+        premise_counts (np.int32): Premise count per clause
+        facts (np.int32): Ids of the initial facts
+        query_id (int): Id of the query symbol, or -1 if unknown
+        n_symbols (int): Total number of symbols in the knowledge base
+
+    Returns:
+        tuple: (is_entailed, path, path_len, parent)
+            - is_entailed (bool): True if the query was reached
+            - path (np.int32): Buffer of inferred symbol ids
+            - path_len (int): Number of valid entries in path
+            - parent (np.int32): Per symbol id, the clause id that fired it,
+              or -1 for facts and unreached symbols
+    """
+    count = premise_counts.copy()
+    queued = np.zeros(n_symbols, dtype=np.uint8)
+    agenda = np.empty(n_symbols, dtype=np.int32)
+    path = np.empty(n_symbols, dtype=np.int32)
+    parent = np.full(n_symbols, -1, dtype=np.int32)
+    head = 0
+    tail = 0
+    path_len = 0
+
+    for i in range(facts.shape[0]):
+        fact = facts[i]
+        if not queued[fact]:
+            queued[fact] = 1
+            agenda[tail] = fact
+            tail += 1
+
+    while head < tail:
+        p = agenda[head]
+        head += 1
+        path[path_len] = p
+        path_len += 1
+
+        if p == query_id:
+            return True, path, path_len, parent
+
+        for i in range(offsets[p], offsets[p + 1]):
+            clause_id = clause_ids[i]
+            count[clause_id] -= 1
+            if count[clause_id] == 0:
+                conclusion = conclusions[clause_id]
+                if not queued[conclusion]:
+                    queued[conclusion] = 1
+                    parent[conclusion] = clause_id
+                    agenda[tail] = conclusion
+                    tail += 1
+
+    return False, path, path_len, parent
+
+
+if njit is not None:
+    _fc_core = njit(cache=True)(_fc_core)
+
+
+# Each distinct query gets one memo slot; past this many entries the
+# least recently used one is evicted
+_QUERY_CACHE_MAX = 1024
 
 
 def forward_chaining(kb, query):
@@ -13,6 +96,9 @@ def forward_chaining(kb, query):
     Determine if a query symbol is entailed by the knowledge base using forward chaining.
 
     This is an implementation of the PL-FC-ENTAILS? algorithm from the project specification.
+    Results are memoized per knowledge base in a bounded LRU, so repeating
+    a query against an unchanged KB is an O(1) dict lookup; adding a
+    clause invalidates the memo.
 
     Args:
         kb (KnowledgeBase): The knowledge base of definite clauses
@@ -23,158 +109,365 @@ def forward_chaining(kb, query):
             - is_entailed (bool): True if the query is entailed, False otherwise
             - inference_path (list): The order of inferred symbols (for visualization)
     """
-    # Initialize count table: count[c] is the number of symbols in c's premise
-    count = {clause: len(clause.premise_literals) for clause in kb.clauses}
+    # A query that is itself a known fact needs no inference at all
+    if query in kb.facts:
+        return True, [query]
+
+    # Drop memoized results that predate the current KB contents
+    if kb._query_cache_version != kb._version:
+        kb._query_cache.clear()
+        kb._query_cache_version = kb._version
+
+    cached = kb._query_cache.get(query)
+    if cached is not None:
+        kb._query_cache.move_to_end(query)
+        is_entailed, inference_path = cached
+        return is_entailed, list(inference_path)
+
+    is_entailed, inference_path = _forward_chaining_uncached(kb, query)
+
+    # Every non-entailed query yields the same full derivation order, so
+    # those entries share the KB's cached closure list instead of each
+    # holding an O(closure) copy
+    if is_entailed:
+        cached_path = list(inference_path)
+    else:
+        cached_path = kb.compute_closure()[1]
+
+    if len(kb._query_cache) >= _QUERY_CACHE_MAX:
+        kb._query_cache.popitem(last=False)
+    kb._query_cache[query] = (is_entailed, cached_path)
+    return is_entailed, inference_path
+
+
+def _forward_chaining_uncached(kb, query):
+    """
+    Run the forward chaining BFS without consulting the per-KB memo.
 
-    # Initialize inferred table: inferred[s] is initially false for all symbols
-    inferred = defaultdict(bool)
+    Args:
+        kb (KnowledgeBase): The knowledge base of definite clauses
+        query (str): The query symbol
+
+    Returns:
+        tuple: (is_entailed, inference_path) as for forward_chaining()
+    """
+    # The closure is computed once per KB version; by construction the
+    # BFS derives every entailed symbol, so the query only decides where
+    # the derivation order is cut off.
+    closure, derivation_order, _ = kb.compute_closure()
+
+    if query in closure:
+        return True, derivation_order[:derivation_order.index(query) + 1]
+    return False, list(derivation_order)
 
-    # Initialize agenda: a queue of symbols, initially symbols known to be true in KB
-    agenda = deque(kb.get_facts())
 
-    # Track inference order for visualization and debugging
+def forward_chaining_semi_naive(kb, query):
+    """
+    Determine entailment using semi-naive (round-based) evaluation.
+
+    Instead of popping one symbol at a time, each round scans only the
+    clauses touched by the symbols newly inferred in the previous round
+    (the "delta"). Batching the count decrements keeps the work on the
+    CSR arrays contiguous and lets NumPy vectorize it, which pays off on
+    dense knowledge bases where many symbols become known per round.
+
+    Args:
+        kb (KnowledgeBase): The knowledge base of definite clauses
+        query (str): The query symbol
+
+    Returns:
+        tuple: (is_entailed, inference_path)
+            - is_entailed (bool): True if the query is entailed, False otherwise
+            - inference_path (list): The order of inferred symbols (round by round)
+    """
+    offsets, clause_ids, conclusions, premise_counts, facts = kb.to_csr()
+
+    query_id = kb.get_symbol_id(query)
+
+    # A narrow count dtype doubles how many counters fit per cache line;
+    # int8 covers any realistic premise count, with int32 as a safety net
+    if premise_counts.size and premise_counts.max() > np.iinfo(np.int8).max:
+        count = premise_counts.copy()
+    else:
+        count = premise_counts.astype(np.int8)
+
+    inferred = np.zeros(kb.n_symbols, dtype=bool)
+    fired_mask = np.zeros(len(kb.clauses), dtype=np.bool_)
     inference_path = []
+    id2sym = kb._id2sym
 
-    # While agenda is not empty
-    while agenda:
-        p = agenda.popleft()
+    # Delta holds the symbols newly inferred this round, starting with the facts
+    delta = np.unique(facts)
+
+    while delta.size:
+        inferred[delta] = True
 
-        # If p is the query, we're done
-        if p == query:
-            inference_path.append(p)  # Add the query to the inference path
+        # Early exit once the query has been inferred, keeping it last in the path
+        if query_id >= 0 and inferred[query_id]:
+            inference_path.extend(
+                id2sym[symbol_id] for symbol_id in delta if symbol_id != query_id)
+            inference_path.append(query)
             return True, inference_path
 
-        # If p has not been inferred yet
-        if not inferred[p]:
-            # Mark p as inferred
-            inferred[p] = True
-            inference_path.append(p)
+        inference_path.extend(id2sym[symbol_id] for symbol_id in delta)
 
-            # For each clause where p is in the premise
-            for clause in kb.get_clauses_with_premise(p):
-                # Decrement the count for this clause
-                count[clause] -= 1
+        # Gather the clauses affected by this round's symbols and decrement
+        # their premise counts in one batched operation
+        affected = np.concatenate(
+            [clause_ids[offsets[symbol_id]:offsets[symbol_id + 1]] for symbol_id in delta])
+        np.subtract.at(count, affected, 1)
 
-                # If all premises are now known (count = 0)
-                if count[clause] == 0:
-                    # Add the conclusion to the agenda
-                    agenda.append(clause.conclusion_literal)
+        # Clauses whose counts just reached zero fire their conclusions;
+        # the fired mask keeps each clause from ever firing twice
+        fired = np.unique(affected[(count[affected] == 0) & ~fired_mask[affected]])
+        fired_mask[fired] = True
+        conclusions_fired = np.unique(conclusions[fired])
+
+        # Next delta is only the conclusions not already inferred
+        delta = conclusions_fired[~inferred[conclusions_fired]]
 
-    # If we get here, the query is not entailed
     return False, inference_path
 
 
-def forward_chaining_with_trace(kb, query):
+# Below this clause count, thread coordination costs more than it saves
+_PARALLEL_THRESHOLD = 10000
+
+
+def forward_chaining_parallel(kb, query, max_workers=4):
     """
-    Extended version of forward chaining that provides detailed tracing.
+    Semi-naive evaluation with per-round work sharded across threads.
 
-    Similar to forward_chaining(), but returns additional information
-    for debugging and visualization.
+    Each round splits the delta set into shards; worker threads gather the
+    CSR clause slices of their shard independently (NumPy releases the GIL
+    during the copies), and the decrements are merged once per round with
+    a single batched subtraction over the affected clauses, so no
+    per-clause synchronization is needed. Small knowledge bases fall back
+    to the single-threaded semi-naive variant, where thread coordination
+    would dominate.
 
     Args:
         kb (KnowledgeBase): The knowledge base of definite clauses
         query (str): The query symbol
+        max_workers (int, optional): Number of worker threads to use
 
     Returns:
-        tuple: (is_entailed, inference_path, trace)
+        tuple: (is_entailed, inference_path)
             - is_entailed (bool): True if the query is entailed, False otherwise
-            - inference_path (list): The order of inferred symbols
-            - trace (list): Detailed trace of algorithm steps
+            - inference_path (list): The order of inferred symbols (round by round)
+    """
+    if len(kb.clauses) < _PARALLEL_THRESHOLD:
+        return forward_chaining_semi_naive(kb, query)
+
+    offsets, clause_ids, conclusions, premise_counts, facts = kb.to_csr()
+
+    query_id = kb.get_symbol_id(query)
+    count = premise_counts.copy()
+    inferred = np.zeros(kb.n_symbols, dtype=bool)
+    inference_path = []
+    id2sym = kb._id2sym
+
+    def gather_shard(shard):
+        """Collect the affected clause ids for one shard of the delta."""
+        return np.concatenate(
+            [clause_ids[offsets[symbol_id]:offsets[symbol_id + 1]] for symbol_id in shard])
+
+    delta = np.unique(facts)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while delta.size:
+            inferred[delta] = True
+
+            # Early exit once the query has been inferred, keeping it last in the path
+            if query_id >= 0 and inferred[query_id]:
+                inference_path.extend(
+                    id2sym[symbol_id] for symbol_id in delta if symbol_id != query_id)
+                inference_path.append(query)
+                return True, inference_path
+
+            inference_path.extend(id2sym[symbol_id] for symbol_id in delta)
+
+            # Gather each shard's affected clauses in parallel, then merge
+            # all decrements in one batched subtraction (no atomics needed).
+            # subtract.at scales with the delta, not with n_clauses, which
+            # matters on chain-shaped KBs with many tiny rounds.
+            shards = [s for s in np.array_split(delta, max_workers) if s.size]
+            affected = np.concatenate(list(executor.map(gather_shard, shards)))
+            np.subtract.at(count, affected, 1)
+
+            # Clauses whose counts just reached zero fire their conclusions
+            fired = np.unique(affected[count[affected] == 0])
+            conclusions_fired = np.unique(conclusions[fired])
+
+            # Next delta is only the conclusions not already inferred
+            delta = conclusions_fired[~inferred[conclusions_fired]]
+
+    return False, inference_path
+
+
+def forward_chaining_trace_iter(kb, query):
+    """
+    Run forward chaining, yielding one trace step dict at a time.
+
+    Streaming the trace avoids materializing O(steps) dicts up front when
+    the caller only prints or partially consumes them. The final yielded
+    step carries a 'result' key ('ENTAILED' or 'NOT ENTAILED') and the
+    complete 'inference_path', so consumers can detect the outcome from
+    the last step alone.
+
+    The initial step reports counts as a list indexed by clause id;
+    consumers that want clause text can format kb.clauses[i] on demand
+    rather than paying for str() on every clause up front.
+
+    Args:
+        kb (KnowledgeBase): The knowledge base of definite clauses
+        query (str): The query symbol
+
+    Yields:
+        dict: One trace step per algorithm action
     """
-    # Initialize count table: count[c] is the number of symbols in c's premise
-    count = {clause: len(clause.premise_literals) for clause in kb.clauses}
+    # A query that is itself a known fact needs no inference at all
+    if query in kb.facts:
+        yield {
+            'step': 0,
+            'action': f'Query is a known fact: {query}',
+            'result': 'ENTAILED',
+            'inference_path': [query]
+        }
+        return
+
+    # Initialize count table: count[c.id] is the number of symbols in c's premise
+    count = kb._premise_counts[:]
+
+    # Intern the query once so the loop compares integer ids, not strings
+    query_id = kb.get_symbol_id(query)
+
+    # Initialize inferred bitmap: inferred[s] is initially 0 for all symbol ids
+    inferred = bytearray(kb.n_symbols)
 
-    # Initialize inferred table: inferred[s] is initially false for all symbols
-    inferred = defaultdict(bool)
+    # Initialize agenda: a queue of symbol ids, initially symbols known to be true in KB
+    agenda = deque(kb.get_fact_ids())
 
-    # Initialize agenda: a queue of symbols, initially symbols known to be true in KB
-    agenda = deque(kb.get_facts())
+    # Local alias for mapping ids back to symbol strings
+    id2sym = kb._id2sym
 
-    # Track inference order and algorithm trace
+    # Track inference order. The trace reports symbols by name, so keep a
+    # parallel dict of inferred names for snapshots.
     inference_path = []
-    trace = []
+    inferred_names = {}
 
     # Initial state for trace
-    trace.append({
+    yield {
         'step': 0,
         'action': 'Initialize',
-        'agenda': list(agenda),
-        'inferred': {k: v for k, v in inferred.items() if v},
-        'count': {str(k): v for k, v in count.items()}
-    })
+        'agenda': [id2sym[i] for i in agenda],
+        'inferred': dict(inferred_names),
+        'count': list(count)
+    }
 
     step = 1
 
     # While agenda is not empty
     while agenda:
-        p = agenda.popleft()
+        pid = agenda.popleft()
+        p = id2sym[pid]
 
-        trace.append({
+        yield {
             'step': step,
             'action': f'Pop from agenda: {p}',
-            'agenda': list(agenda),
+            'agenda': [id2sym[i] for i in agenda],
             'current': p
-        })
+        }
         step += 1
 
-        # If p is the query, we're done
-        if p == query:
-            inference_path.append(p)
-            trace.append({
+        # Skip symbols that were already inferred; gating everything on the
+        # inferred test (including the query check) means duplicate pops
+        # cost a single bitmap read
+        if inferred[pid]:
+            continue
+
+        # Mark p as inferred
+        inferred[pid] = 1
+        inference_path.append(p)
+
+        # The query can only be newly inferred once, so checking it here
+        # instead of on every pop preserves the result
+        if pid == query_id:
+            yield {
                 'step': step,
                 'action': f'Found query: {p}',
-                'result': 'ENTAILED'
-            })
-            return True, inference_path, trace
+                'result': 'ENTAILED',
+                'inference_path': inference_path
+            }
+            return
 
-        # If p has not been inferred yet
-        if not inferred[p]:
-            # Mark p as inferred
-            inferred[p] = True
-            inference_path.append(p)
+        inferred_names[p] = True
+        yield {
+            'step': step,
+            'action': f'Infer: {p}',
+            'inferred': dict(inferred_names)
+        }
+        step += 1
 
-            trace.append({
+        # For each clause where p is in the premise
+        affected_clauses = kb.clauses_by_premise[pid]
+        for clause in affected_clauses:
+            # Decrement the count for this clause with a single index
+            # read and write; the old value is recovered arithmetically
+            clause_id = clause.id
+            new_count = count[clause_id] - 1
+            count[clause_id] = new_count
+            old_count = new_count + 1
+
+            yield {
                 'step': step,
-                'action': f'Infer: {p}',
-                'inferred': {k: v for k, v in inferred.items() if v}
-            })
+                'action': f'Update count for {clause}',
+                'clause': str(clause),
+                'old_count': old_count,
+                'new_count': new_count
+            }
             step += 1
 
-            # For each clause where p is in the premise
-            affected_clauses = kb.get_clauses_with_premise(p)
-            for clause in affected_clauses:
-                # Decrement the count for this clause
-                old_count = count[clause]
-                count[clause] -= 1
-                new_count = count[clause]
+            # If all premises are now known (count = 0)
+            if new_count == 0:
+                # Add the conclusion to the agenda
+                conclusion_id = clause.conclusion_id
+                agenda.append(conclusion_id)
 
-                trace.append({
+                yield {
                     'step': step,
-                    'action': f'Update count for {clause}',
-                    'clause': str(clause),
-                    'old_count': old_count,
-                    'new_count': new_count
-                })
+                    'action': f'Add to agenda: {id2sym[conclusion_id]}',
+                    'reason': f'All premises of {clause} are known',
+                    'agenda': [id2sym[i] for i in agenda]
+                }
                 step += 1
 
-                # If all premises are now known (count = 0)
-                if new_count == 0:
-                    # Add the conclusion to the agenda
-                    conclusion = clause.conclusion_literal
-                    agenda.append(conclusion)
-
-                    trace.append({
-                        'step': step,
-                        'action': f'Add to agenda: {conclusion}',
-                        'reason': f'All premises of {clause} are known',
-                        'agenda': list(agenda)
-                    })
-                    step += 1
-
     # If we get here, the query is not entailed
-    trace.append({
+    yield {
         'step': step,
         'action': 'Agenda empty',
-        'result': 'NOT ENTAILED'
-    })
-    return False, inference_path, trace
\ No newline at end of file
+        'result': 'NOT ENTAILED',
+        'inference_path': inference_path
+    }
+
+
+def forward_chaining_with_trace(kb, query):
+    """
+    Extended version of forward chaining that provides detailed tracing.
+
+    Similar to forward_chaining(), but returns additional information
+    for debugging and visualization. This materializes the streaming
+    trace from forward_chaining_trace_iter().
+
+    Args:
+        kb (KnowledgeBase): The knowledge base of definite clauses
+        query (str): The query symbol
+
+    Returns:
+        tuple: (is_entailed, inference_path, trace)
+            - is_entailed (bool): True if the query is entailed, False otherwise
+            - inference_path (list): The order of inferred symbols
+            - trace (list): Detailed trace of algorithm steps
+    """
+    trace = list(forward_chaining_trace_iter(kb, query))
+    final_step = trace[-1]
+    return final_step['result'] == 'ENTAILED', final_step['inference_path'], trace
\ No newline at end of file
@@ -5,9 +5,22 @@ This module contains the KnowledgeBase class which manages a collection
 of definite clauses and provides operations for inference.
 """
 
-from collections import defaultdict
+from array import array
+from collections import OrderedDict
+
+import numpy as np
+
 from src.clause import Clause
 
+# Shared empty result for premise lookups on unknown symbols, so misses
+# don't allocate a fresh list per call
+_NO_CLAUSES = ()
+
+# Largest symbol count for which the bitmask fast path fits in a machine
+# word; beyond this, Python ints go arbitrary-precision and the masks
+# would cost O(n_symbols) bytes per clause
+_MASK_SYMBOL_LIMIT = 64
+
 
 class KnowledgeBase:
     """
@@ -22,30 +35,182 @@ class KnowledgeBase:
         Initialize an empty knowledge base.
         """
         self.clauses = []  # List of all clauses
-        self.clauses_by_premise = defaultdict(list)  # Map from symbols to clauses containing them in premise
+        self._clause_set = set()  # Content hashes of stored clauses, for O(1) dedupe
+        self._clause_strs = []  # Pre-formatted clause strings, appended at add time
+        self.clauses_by_premise = []  # List indexed by symbol id, of clauses containing the symbol in premise
+        self.clauses_by_conclusion = []  # List indexed by symbol id, of clauses concluding the symbol
         self.facts = set()  # Set of known facts (symbols)
+        self.symbols = set()  # Live set of all symbols, maintained by _intern
+        self._sym2id = {}  # Map from symbol string to its integer id
+        self._id2sym = []  # Map from integer id back to symbol string
+        self._fact_ids = []  # Ids of known facts, in insertion order
+        self._facts_list = []  # Fact symbols in insertion order, parallel to _fact_ids
+        self._premise_counts = []  # Premise count per clause, indexed by clause id
+        self._csr = None  # Cached CSR encoding, invalidated by add_clause
+        self._version = 0  # Bumped by add_clause to invalidate external caches
+        self._query_cache = OrderedDict()  # LRU memo of (is_entailed, path) per query symbol
+        self._query_cache_version = 0  # KB version the memo was built against
+        self._closure = None  # Cached (closure, order, parents) of all entailed symbols
+        self._closure_version = 0  # KB version the closure was computed against
+        self._premise_masks = None  # Cached per-clause bitmasks for the small-KB fast path
+        self._premise_masks_version = 0  # KB version the masks were built against
+
+    def _intern(self, symbol):
+        """
+        Intern a symbol string, assigning it an integer id on first sight.
+
+        Interned ids let the inference algorithm work on plain integers
+        instead of hashing symbol strings on every lookup.
+
+        Args:
+            symbol (str): The symbol to intern
+
+        Returns:
+            int: The integer id assigned to the symbol
+        """
+        symbol_id = self._sym2id.get(symbol)
+        if symbol_id is None:
+            symbol_id = len(self._id2sym)
+            self._sym2id[symbol] = symbol_id
+            self._id2sym.append(symbol)
+            self.clauses_by_premise.append([])
+            self.clauses_by_conclusion.append([])
+            self.symbols.add(symbol)
+        return symbol_id
+
+    @property
+    def n_symbols(self):
+        """
+        Get the number of distinct symbols in the knowledge base.
+
+        Returns:
+            int: The number of interned symbols
+        """
+        return len(self._id2sym)
 
     def add_clause(self, clause):
         """
         Add a clause to the knowledge base.
 
+        Duplicate clauses (same premises and conclusion) are ignored, so
+        redundant input lines don't inflate the clause indexes or cause
+        the inference loop to fire the same rule twice.
+
         Args:
             clause (Clause): The clause to add
         """
+        # Clauses hash by logical content, so a set lookup spots duplicates
+        if clause in self._clause_set:
+            return
+        self._clause_set.add(clause)
+
+        # Assign the clause an integer id so counts can live in a flat array
+        clause.id = len(self.clauses)
         self.clauses.append(clause)
+        self._premise_counts.append(clause._n_premises)
+        self._clause_strs.append(str(clause))
+
+        # Intern all literals so the algorithm can operate on integer ids
+        clause.premise_ids = tuple(self._intern(literal) for literal in clause.premise_literals)
+        clause.conclusion_id = self._intern(clause.conclusion_literal)
 
         # If it's a fact, add it to our facts set
-        if clause.is_fact:
+        if clause.is_fact and clause.conclusion_literal not in self.facts:
             self.facts.add(clause.conclusion_literal)
+            self._fact_ids.append(clause.conclusion_id)
+            self._facts_list.append(clause.conclusion_literal)
 
-        # Index the clause by its premise literals
-        for literal in clause.premise_literals:
-            self.clauses_by_premise[literal].append(clause)
+        # Index the clause by its premise ids and its conclusion id
+        for premise_id in clause.premise_ids:
+            self.clauses_by_premise[premise_id].append(clause)
+        self.clauses_by_conclusion[clause.conclusion_id].append(clause)
+
+        # The cached CSR encoding no longer matches the clause set
+        self._csr = None
+        self._version += 1
 
     def load_from_file(self, filename):
         """
         Load clauses from a file.
 
+        The whole file is slurped with one large-buffer read and handed to
+        the bulk text parser, instead of paying per-line I/O and a
+        Clause.from_string call per clause.
+
+        Args:
+            filename (str): Path to the file containing clauses
+
+        Returns:
+            KnowledgeBase: self for method chaining
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+            ValueError: If a line in the file isn't a valid clause
+        """
+        with open(filename, 'r', buffering=1 << 20) as file:
+            text = file.read()
+        return self.load_from_text(text)
+
+    def load_from_text(self, text):
+        """
+        Load clauses from a string containing one clause per line.
+
+        Args:
+            text (str): Clause lines in the same format as the data files
+
+        Returns:
+            KnowledgeBase: self for method chaining
+
+        Raises:
+            ValueError: If a line has no positive literal (conclusion)
+        """
+        return self.load_from_lines(text.splitlines())
+
+    def load_from_lines(self, lines):
+        """
+        Load clauses from an iterable of lines.
+
+        This is the core bulk parsing path behind load_from_file and
+        load_from_text: split() does the tokenizing in C string code and
+        each line is partitioned into premises and conclusion with list
+        comprehensions, bypassing the per-clause Clause.from_string call
+        chain. Taking any iterable means in-memory sources (StringIO
+        buffers, HTTP bodies, database rows) load without touching the
+        filesystem.
+
+        Args:
+            lines (iterable): Clause lines in the same format as the data files
+
+        Returns:
+            KnowledgeBase: self for method chaining
+
+        Raises:
+            ValueError: If a line has no positive literal (conclusion)
+        """
+        for line in lines:
+            tokens = line.split()
+            if not tokens:
+                continue
+
+            premise_literals = [token[1:] for token in tokens if token[0] == '-']
+            conclusion_literal = next((token for token in tokens if token[0] != '-'), None)
+
+            if conclusion_literal is None:
+                raise ValueError("Definite clause must have exactly one positive literal (conclusion)")
+
+            self.add_clause(Clause(premise_literals, conclusion_literal))
+        return self
+
+    def load_from_file_fast(self, filename):
+        """
+        Load clauses from a file using a two-pass bulk insert.
+
+        The first pass parses and interns every clause while tallying how
+        many clauses mention each symbol in their premise; the second pass
+        fills exact-size index buckets through write cursors. This avoids
+        the repeated list growth that per-clause add_clause calls incur,
+        which dominates load time on large files.
+
         Args:
             filename (str): Path to the file containing clauses
 
@@ -57,11 +222,68 @@ class KnowledgeBase:
             ValueError: If a line in the file isn't a valid clause
         """
         with open(filename, 'r') as file:
-            for line in file:
-                line = line.strip()
-                if line:  # Skip empty lines
-                    clause = Clause.from_string(line)
-                    self.add_clause(clause)
+            lines = file.read().splitlines()
+
+        # Tokenize exactly as load_from_lines does: premises are the '-'
+        # tokens wherever they appear, since data lines may put the
+        # conclusion first (e.g. 'a -b -c'). Clause.from_string stops at
+        # the first positive token and would misparse those lines.
+        clauses = []
+        for line in lines:
+            tokens = line.split()
+            if not tokens:
+                continue
+
+            premise_literals = [token[1:] for token in tokens if token[0] == '-']
+            conclusion_literal = next((token for token in tokens if token[0] != '-'), None)
+
+            if conclusion_literal is None:
+                raise ValueError("Definite clause must have exactly one positive literal (conclusion)")
+
+            clauses.append(Clause(premise_literals, conclusion_literal))
+
+        # First pass: assign ids, intern literals, and tally premise usage;
+        # duplicate clauses are dropped here, mirroring add_clause
+        premise_tally = {}
+        unique_clauses = []
+        for clause in clauses:
+            if clause in self._clause_set:
+                continue
+            self._clause_set.add(clause)
+            unique_clauses.append(clause)
+
+            clause.id = len(self.clauses)
+            self.clauses.append(clause)
+            self._premise_counts.append(clause._n_premises)
+            self._clause_strs.append(str(clause))
+
+            clause.premise_ids = tuple(self._intern(literal) for literal in clause.premise_literals)
+            clause.conclusion_id = self._intern(clause.conclusion_literal)
+            self.clauses_by_conclusion[clause.conclusion_id].append(clause)
+
+            if clause.is_fact and clause.conclusion_literal not in self.facts:
+                self.facts.add(clause.conclusion_literal)
+                self._fact_ids.append(clause.conclusion_id)
+                self._facts_list.append(clause.conclusion_literal)
+
+            for premise_id in clause.premise_ids:
+                premise_tally[premise_id] = premise_tally.get(premise_id, 0) + 1
+
+        # Preallocate exact-size buckets, remembering where each fill starts
+        cursors = {}
+        for premise_id, occurrences in premise_tally.items():
+            bucket = self.clauses_by_premise[premise_id]
+            cursors[premise_id] = len(bucket)
+            bucket.extend([None] * occurrences)
+
+        # Second pass: place each clause at its bucket cursor
+        for clause in unique_clauses:
+            for premise_id in clause.premise_ids:
+                self.clauses_by_premise[premise_id][cursors[premise_id]] = clause
+                cursors[premise_id] += 1
+
+        self._csr = None
+        self._version += 1
         return self
 
     def get_facts(self):
@@ -73,6 +295,147 @@ class KnowledgeBase:
         """
         return self.facts
 
+    def get_facts_ordered(self):
+        """
+        Get all facts in insertion order.
+
+        Unlike get_facts(), the returned list enumerates facts in the
+        deterministic order they were added, without set iteration.
+
+        Returns:
+            list: Fact symbols in insertion order
+        """
+        return self._facts_list
+
+    def get_fact_ids(self):
+        """
+        Get the ids of all facts in the knowledge base.
+
+        Returns:
+            list: List of fact symbol ids, in insertion order
+        """
+        return self._fact_ids
+
+    def get_symbol_id(self, symbol):
+        """
+        Get the integer id of a symbol.
+
+        Args:
+            symbol (str): The symbol to look up
+
+        Returns:
+            int: The id of the symbol, or -1 if the symbol is unknown
+        """
+        return self._sym2id.get(symbol, -1)
+
+    def to_csr(self):
+        """
+        Encode the knowledge base as CSR (compressed sparse row) arrays.
+
+        The CSR form gives the inference loop sequential, cache-friendly
+        access to the clauses affected by each symbol. The encoding is
+        cached and rebuilt only after new clauses are added.
+
+        Returns:
+            tuple: (offsets, clause_ids, conclusions, premise_counts, facts)
+                - offsets (np.int32, n_symbols + 1): start of each symbol's
+                  clause slice in clause_ids
+                - clause_ids (np.int32): ids of clauses containing each
+                  symbol in their premise, grouped by symbol
+                - conclusions (np.int32, n_clauses): conclusion id per clause
+                - premise_counts (np.int32, n_clauses): premise count per clause
+                - facts (np.int32): ids of known facts, in insertion order
+        """
+        if self._csr is None:
+            offsets = np.zeros(self.n_symbols + 1, dtype=np.int32)
+            for symbol_id, clauses in enumerate(self.clauses_by_premise):
+                offsets[symbol_id + 1] = offsets[symbol_id] + len(clauses)
+
+            clause_ids = np.fromiter(
+                (clause.id for clauses in self.clauses_by_premise for clause in clauses),
+                dtype=np.int32, count=int(offsets[-1]))
+            conclusions = np.fromiter(
+                (clause.conclusion_id for clause in self.clauses),
+                dtype=np.int32, count=len(self.clauses))
+            premise_counts = np.array(self._premise_counts, dtype=np.int32)
+            facts = np.array(self._fact_ids, dtype=np.int32)
+
+            self._csr = (offsets, clause_ids, conclusions, premise_counts, facts)
+        return self._csr
+
+    def compute_closure(self):
+        """
+        Compute every symbol entailed by the knowledge base, regardless of query.
+
+        The forward chaining BFS derives the full set of entailed symbols
+        by construction, so computing it once lets any number of queries
+        be answered by membership tests. The result is cached and only
+        recomputed after new clauses are added.
+
+        Returns:
+            tuple: (closure, derivation_order, parent_map)
+                - closure (set): All symbols entailed by the knowledge base
+                - derivation_order (list): Symbols in the order they were derived
+                - parent_map (dict): Per derived symbol, the Clause that fired
+                  it, or None for facts
+        """
+        if self._closure is not None and self._closure_version == self._version:
+            return self._closure
+
+        # Imported here so the data module stays importable on its own
+        from src.forward_chaining import _fc_core, njit
+
+        id2sym = self._id2sym
+
+        if njit is not None:
+            # Run the compiled kernel with no query so it derives everything
+            offsets, clause_ids, conclusions, premise_counts, facts = self.to_csr()
+            _, path, path_len, parent = _fc_core(
+                offsets, clause_ids, conclusions, premise_counts, facts,
+                -1, self.n_symbols)
+            derivation_order = [id2sym[i] for i in path[:path_len]]
+            parent_map = {
+                id2sym[i]: self.clauses[parent[i]] if parent[i] >= 0 else None
+                for i in path[:path_len]
+            }
+        else:
+            count = self._premise_counts[:]
+            queued = bytearray(self.n_symbols)
+            derivation_order = []
+            parent_map = {}
+
+            # Preallocated ring buffer: each symbol is enqueued at most once
+            # thanks to the queued bitmap, so n_symbols slots always suffice
+            agenda = array('i', [0] * self.n_symbols)
+            head = 0
+            tail = 0
+
+            for fact_id in self._fact_ids:
+                if not queued[fact_id]:
+                    queued[fact_id] = 1
+                    parent_map[id2sym[fact_id]] = None
+                    agenda[tail] = fact_id
+                    tail += 1
+
+            while head < tail:
+                p = agenda[head]
+                head += 1
+                derivation_order.append(id2sym[p])
+
+                for clause in self.clauses_by_premise[p]:
+                    count[clause.id] -= 1
+                    if count[clause.id] == 0:
+                        conclusion_id = clause.conclusion_id
+                        if not queued[conclusion_id]:
+                            queued[conclusion_id] = 1
+                            parent_map[id2sym[conclusion_id]] = clause
+                            agenda[tail] = conclusion_id
+                            tail += 1
+
+        self._closure = (set(derivation_order), derivation_order, parent_map)
+        self._closure_version = self._version
+        return self._closure
+
     def get_clauses_with_premise(self, symbol):
         """
         Get all clauses that have the given symbol in their premise.
@@ -81,34 +444,134 @@ class KnowledgeBase:
             symbol (str): The symbol to search for in premises
 
         Returns:
-            list: List of clauses containing the symbol in their premise
+            list: Clauses containing the symbol in their premise; a shared
+            empty sequence is returned for symbols the KB has never seen
         """
-        return self.clauses_by_premise.get(symbol, [])
+        symbol_id = self._sym2id.get(symbol)
+        if symbol_id is None:
+            return _NO_CLAUSES
+        return self.clauses_by_premise[symbol_id]
 
-    def get_all_symbols(self):
+    def _get_premise_masks(self):
         """
-        Get all unique symbols used in the knowledge base.
+        Get the per-clause premise bitmasks, building them on first use.
+
+        The masks only make sense while the whole symbol space fits in a
+        machine word, so they are computed lazily here rather than at
+        add_clause time — a large knowledge base never pays for them at
+        all. The list is cached and rebuilt only after clauses are added.
 
         Returns:
-            set: Set of all symbols
+            list: Per clause id, a bitmask with bit i set for premise symbol id i
+
+        Raises:
+            ValueError: If the knowledge base has more than 64 symbols
+        """
+        if self.n_symbols > _MASK_SYMBOL_LIMIT:
+            raise ValueError(
+                f"Bitmask fast path requires at most {_MASK_SYMBOL_LIMIT} symbols; "
+                "use compute_closure instead")
+
+        if self._premise_masks is None or self._premise_masks_version != self._version:
+            masks = []
+            for clause in self.clauses:
+                mask = 0
+                for premise_id in clause.premise_ids:
+                    mask |= 1 << premise_id
+                masks.append(mask)
+            self._premise_masks = masks
+            self._premise_masks_version = self._version
+        return self._premise_masks
+
+    def get_facts_mask(self):
+        """
+        Get the known facts as a bitmask, with bit i set for symbol id i.
+
+        Returns:
+            int: Bitmask of known fact symbol ids
+
+        Raises:
+            ValueError: If the knowledge base has more than 64 symbols;
+                the mask is only a machine-word fast path below that
+        """
+        if self.n_symbols > _MASK_SYMBOL_LIMIT:
+            raise ValueError(
+                f"Bitmask fast path requires at most {_MASK_SYMBOL_LIMIT} symbols; "
+                "use compute_closure instead")
+
+        mask = 0
+        for fact_id in self._fact_ids:
+            mask |= 1 << fact_id
+        return mask
+
+    def step(self, facts_mask):
+        """
+        Apply every clause once to a fact bitmask (SWAR fast path).
+
+        Each clause gets a lazily built premise bitmask, so the "are all
+        premises known" check collapses to a branch-free
+        (facts & mask) == mask comparison — one AND and one compare per
+        clause, with no set or dict lookups. Iterating step() to a
+        fixpoint yields the closure for small knowledge bases; callers
+        that need derivation order should use compute_closure instead.
+
+        Args:
+            facts_mask (int): Bitmask of currently known symbol ids
+
+        Returns:
+            int: The input mask ORed with every conclusion whose clause fired
+
+        Raises:
+            ValueError: If the knowledge base has more than 64 symbols
+        """
+        premise_masks = self._get_premise_masks()
+        derived = facts_mask
+        for clause, premise_mask in zip(self.clauses, premise_masks):
+            if (facts_mask & premise_mask) == premise_mask:
+                derived |= 1 << clause.conclusion_id
+        return derived
+
+    def get_clauses_with_conclusion(self, symbol):
         """
-        symbols = set()
+        Get all clauses that conclude the given symbol.
 
-        # Add all conclusion literals
-        for clause in self.clauses:
-            symbols.add(clause.conclusion_literal)
+        The index is maintained as clauses are added, so answering "which
+        rules can derive this symbol" is a direct lookup instead of a scan
+        over every clause.
 
-            # Add all premise literals
-            for literal in clause.premise_literals:
-                symbols.add(literal)
+        Args:
+            symbol (str): The symbol to search for as a conclusion
 
-        return symbols
+        Returns:
+            list: Clauses concluding the symbol; a shared empty sequence
+            is returned for symbols the KB has never seen
+        """
+        symbol_id = self._sym2id.get(symbol)
+        if symbol_id is None:
+            return _NO_CLAUSES
+        return self.clauses_by_conclusion[symbol_id]
+
+    def get_all_symbols(self):
+        """
+        Get all unique symbols used in the knowledge base.
+
+        The set is maintained as clauses are added, so this is O(1);
+        callers should treat the returned set as read-only.
+
+        Returns:
+            set: Set of all symbols
+        """
+        return self.symbols
 
     def __str__(self):
         """
         Return a string representation of the knowledge base.
 
+        The per-clause strings are formatted once at add time, so printing
+        the knowledge base is a single join rather than a re-render of
+        every clause.
+
         Returns:
             str: A formatted string listing all clauses in the knowledge base
         """
-        return "\n".join(str(clause) for clause in self.clauses)
\ No newline at end of file
+        return "\n".join(self._clause_strs)
\ No newline at end of file
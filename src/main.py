@@ -10,7 +10,11 @@ import os
 import sys
 import json
 from src.knowledge_base import KnowledgeBase
-from src.forward_chaining import forward_chaining, forward_chaining_with_trace
+from src.forward_chaining import (
+    forward_chaining,
+    forward_chaining_trace_iter,
+    forward_chaining_with_trace,
+)
 from src.visualizer import create_knowledge_graph, save_graph_to_file
 
 
@@ -53,19 +57,18 @@ def main():
         if args.verbose:
             print("\nKnowledge base contents:")
             print(kb)
-            print(f"\nInitial facts: {', '.join(kb.get_facts())}\n")
+            print(f"\nInitial facts: {', '.join(kb.get_facts_ordered())}\n")
 
         # Run forward chaining
         print(f"\nRunning forward chaining to check if '{args.query}' is entailed...")
 
-        if args.verbose or args.trace_file:
+        if args.trace_file:
+            # The JSON dump needs the whole trace, so materialize it
             is_entailed, inference_path, trace = forward_chaining_with_trace(kb, args.query)
 
-            # Save trace to file if requested
-            if args.trace_file:
-                with open(args.trace_file, 'w') as f:
-                    json.dump(trace, f, indent=2)
-                print(f"Execution trace saved to '{args.trace_file}'")
+            with open(args.trace_file, 'w') as f:
+                json.dump(trace, f, indent=2)
+            print(f"Execution trace saved to '{args.trace_file}'")
 
             # Print detailed trace if verbose
             if args.verbose:
@@ -76,6 +79,21 @@ def main():
                         if k not in ['step', 'action']:
                             print(f"  {k}: {v}")
                     print()
+        elif args.verbose:
+            # Stream trace steps as they are generated instead of holding
+            # the whole list in memory; the final step carries the result
+            print("\nExecution trace:")
+            final_step = None
+            for step in forward_chaining_trace_iter(kb, args.query):
+                print(f"Step {step['step']}: {step['action']}")
+                for k, v in step.items():
+                    if k not in ['step', 'action']:
+                        print(f"  {k}: {v}")
+                print()
+                final_step = step
+
+            is_entailed = final_step['result'] == 'ENTAILED'
+            inference_path = final_step['inference_path']
         else:
             is_entailed, inference_path = forward_chaining(kb, args.query)
 
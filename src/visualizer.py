@@ -5,84 +5,186 @@ This module provides functionality to create graphviz directed graphs
 representing the knowledge base and inference paths.
 """
 
-import graphviz
+import functools
+import io
+import re
+from concurrent.futures import ThreadPoolExecutor
 
+# graphviz is imported lazily: loading it pulls in its subprocess and
+# backend machinery at startup, a cost callers that never visualize
+# (plain queries, benchmarks) shouldn't pay
+_graphviz = None
 
-def create_knowledge_graph(kb, inference_path=None):
+
+def _gv():
     """
-    Create a visualization of the knowledge base as a directed graph.
+    Import graphviz on first use and cache the module.
 
-    This function creates a Graphviz graph showing the relationships between
-    literals in the knowledge base. If an inference path is provided,
-    the nodes in the path are highlighted.
+    Returns:
+        module: The graphviz package
+    """
+    global _graphviz
+    if _graphviz is None:
+        import graphviz
+        _graphviz = graphviz
+    return _graphviz
+
+# Extracts the node name from a DOT node line like '\ta [label=a]' or
+# '\t"foo-bar" [label="foo-bar"]'; names that need quoting are matched
+# as full quoted strings, including escaped characters. A bare
+# graph/node/edge before '[' is always a default-attribute statement,
+# never a node — quote() quotes DOT keywords used as node names — so the
+# unquoted arm excludes them (keywords are case-insensitive in DOT).
+_NODE_RE = re.compile(r'^\s*("(?:[^"\\]|\\.)*"|(?!(?i:graph|node|edge)\b)\w+)\s*\[')
+
+# Undoes quote()'s backslash escapes when recovering a quoted node name
+_UNESCAPE_RE = re.compile(r'\\(.)')
+
+# Default attribute lines shared by both graph builders
+_GRAPH_ATTR_LINES = (
+    '\tgraph [rankdir=BT ratio=fill size="10,10"]\n',
+    '\tnode [fillcolor=lightgray fontname=Arial fontsize=12 shape=ellipse style=filled]\n',
+    '\tedge [fontname=Arial fontsize=10]\n',
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _path_fillcolor(pos, path_len):
+    """
+    Return the gradient fill color for a node on the inference path.
+
+    Earlier inferences are darker green, later ones lighter. Formatting a
+    color string costs an f-string plus int() per node, so the result is
+    memoized on (position, path length) — repeated renders of the same
+    path hit the cache instead of reformatting.
+
+    Args:
+        pos (int): The symbol's position in the inference path
+        path_len (int): The total length of the inference path
+
+    Returns:
+        str: A hex color string like '#006400'
+    """
+    color_intensity = 100 - min(80, 80 * pos / path_len)
+    return f'#00{int(color_intensity):02x}00'
+
+
+def _dot_body_lines(kb, inference_path=None):
+    """
+    Generate the DOT node and edge lines for a knowledge base.
+
+    This is the single formatting pass shared by create_knowledge_graph
+    and create_knowledge_graph_source.
 
     Args:
         kb (KnowledgeBase): The knowledge base to visualize
         inference_path (list, optional): The order of inferred symbols from forward chaining
 
     Returns:
-        graphviz.Digraph: A graphviz graph representing the knowledge base
+        list: DOT source lines (newline-terminated) for the graph body
     """
-    # Create a new directed graph
-    dot = graphviz.Digraph(comment='Knowledge Base', format='png')
+    quote = _gv().quoting.quote
+    lines = []
 
-    # Set graph attributes for better appearance
-    dot.attr('graph', rankdir='BT', size='10,10', ratio='fill')
-    dot.attr('node', shape='ellipse', style='filled', fillcolor='lightgray',
-             fontname='Arial', fontsize='12')
-    dot.attr('edge', fontname='Arial', fontsize='10')
+    # Position of each symbol in the inference path, computed once so the
+    # coloring loop below does O(1) lookups instead of repeated list scans
+    path_pos = {s: i for i, s in enumerate(inference_path)} if inference_path else {}
 
     # Create a unique identifier for intermediate nodes
     node_id = 0
 
     # Add all literals as nodes first
     for symbol in kb.get_all_symbols():
+        name = quote(symbol)
+
         # If inference path is provided, color the nodes accordingly
-        if inference_path and symbol in inference_path:
-            # Get the position in the inference path
-            pos = inference_path.index(symbol)
-            # Use a color gradient for the inference path
-            # The first nodes are darker green, later nodes lighter
-            color_intensity = 100 - min(80, 80 * pos / len(inference_path))
-            fillcolor = f'#00{int(color_intensity):02x}00'
-            fontcolor = 'white'
-            dot.node(symbol, symbol, fillcolor=fillcolor, fontcolor=fontcolor)
+        if symbol in path_pos:
+            # Use the memoized color gradient for the inference path
+            fillcolor = _path_fillcolor(path_pos[symbol], len(inference_path))
+            lines.append(f'\t{name} [label={name} fillcolor="{fillcolor}" fontcolor=white]\n')
         else:
-            dot.node(symbol, symbol)
+            lines.append(f'\t{name} [label={name}]\n')
 
     # Add edges for each clause
     for clause in kb.clauses:
-        conclusion = clause.conclusion_literal
+        conclusion = quote(clause.conclusion_literal)
 
         # Handle facts (clauses with no premises)
         if clause.is_fact:
             # For facts, use a special "FACT" node as source
             fact_node = f"FACT_{node_id}"
             node_id += 1
-            dot.node(fact_node, "FACT", shape='box', fillcolor='lightblue')
-            dot.edge(fact_node, conclusion, label='given')
+            lines.append(f'\t{fact_node} [label=FACT shape=box fillcolor=lightblue]\n')
+            lines.append(f'\t{fact_node} -> {conclusion} [label=given]\n')
 
         # Handle clauses with premises
-        elif len(clause.premise_literals) == 1:
+        elif clause._n_premises == 1:
             # Single premise: direct edge
-            premise = clause.premise_literals[0]
-            dot.edge(premise, conclusion, label='implies')
+            premise = quote(clause.premise_literals[0])
+            lines.append(f'\t{premise} -> {conclusion} [label=implies]\n')
         else:
             # Multiple premises: create an AND node
             and_node = f"AND_{node_id}"
             node_id += 1
-            dot.node(and_node, "AND", shape='diamond', fillcolor='lightyellow')
+            lines.append(f'\t{and_node} [label=AND shape=diamond fillcolor=lightyellow]\n')
 
             # Connect each premise to the AND node
             for premise in clause.premise_literals:
-                dot.edge(premise, and_node)
+                lines.append(f'\t{quote(premise)} -> {and_node}\n')
 
             # Connect the AND node to the conclusion
-            dot.edge(and_node, conclusion)
+            lines.append(f'\t{and_node} -> {conclusion}\n')
+
+    return lines
+
+
+def create_knowledge_graph(kb, inference_path=None):
+    """
+    Create a visualization of the knowledge base as a directed graph.
+
+    This function creates a Graphviz graph showing the relationships between
+    literals in the knowledge base. If an inference path is provided,
+    the nodes in the path are highlighted.
 
+    Args:
+        kb (KnowledgeBase): The knowledge base to visualize
+        inference_path (list, optional): The order of inferred symbols from forward chaining
+
+    Returns:
+        graphviz.Digraph: A graphviz graph representing the knowledge base
+    """
+    # Create a new directed graph and append the prebuilt lines in one batch
+    dot = _gv().Digraph(comment='Knowledge Base', format='png')
+    dot.body += _GRAPH_ATTR_LINES
+    dot.body += _dot_body_lines(kb, inference_path)
     return dot
 
 
+def create_knowledge_graph_source(kb, inference_path=None):
+    """
+    Create the knowledge graph as a graphviz.Source built from one buffer.
+
+    Writing the DOT source into a StringIO and wrapping it in Source skips
+    the Digraph object entirely, which is the cheapest route when the
+    caller only wants to render or pipe the graph.
+
+    Args:
+        kb (KnowledgeBase): The knowledge base to visualize
+        inference_path (list, optional): The order of inferred symbols from forward chaining
+
+    Returns:
+        graphviz.Source: The assembled DOT source, ready to render
+    """
+    buf = io.StringIO()
+    buf.write('digraph {\n')
+    for line in _GRAPH_ATTR_LINES:
+        buf.write(line)
+    for line in _dot_body_lines(kb, inference_path):
+        buf.write(line)
+    buf.write('}\n')
+    return _gv().Source(buf.getvalue(), format='png')
+
+
 def highlight_inference_path(graph, inference_path):
     """
     Highlight the inference path in the graph.
@@ -94,23 +196,69 @@ def highlight_inference_path(graph, inference_path):
     Returns:
         graphviz.Digraph: The modified graph with highlighted path
     """
-    # Create a copy to avoid modifying the original
-    highlighted = graph.copy()
+    # Position of each symbol in the inference path, for O(1) membership
+    # and gradient lookups while scanning the body
+    quote = _gv().quoting.quote
+    path_pos = {s: i for i, s in enumerate(inference_path)}
+    path_len = len(inference_path)
 
-    # Highlight nodes in the inference path
-    for i, symbol in enumerate(inference_path):
-        # Use a color gradient
-        color_intensity = 100 - min(80, 80 * i / len(inference_path))
-        fillcolor = f'#00{int(color_intensity):02x}00'
-        highlighted.node(symbol, symbol, style='filled', fillcolor=fillcolor, fontcolor='white')
+    # Rewrite node lines for path symbols in a single pass over the body,
+    # instead of appending duplicate node statements via graph.node()
+    body = []
+    for line in graph.body:
+        match = _NODE_RE.match(line)
+        if match:
+            name = match.group(1)
+            # Strip quotes and unescape so the lookup sees the raw symbol
+            symbol = _UNESCAPE_RE.sub(r'\1', name[1:-1]) if name[0] == '"' else name
+            if symbol in path_pos:
+                name = quote(symbol)
+                # Same memoized color gradient as _dot_body_lines
+                fillcolor = _path_fillcolor(path_pos[symbol], path_len)
+                line = f'\t{name} [label={name} style=filled fillcolor="{fillcolor}" fontcolor=white]\n'
+        body.append(line)
 
+    # Return a copy so the caller's graph stays unchanged
+    highlighted = graph.copy()
+    highlighted.body = body
     return highlighted
 
 
+# Rendered PNG bytes keyed by DOT source. Each pipe() call spawns a dot
+# subprocess, which dominates render time for small graphs; caching the
+# output lets repeated saves of an unchanged graph skip the spawn.
+_render_cache = {}
+_RENDER_CACHE_MAX = 64
+
+
+def _pipe_png(graph):
+    """
+    Render a graph to PNG bytes, reusing cached output when possible.
+
+    Args:
+        graph (graphviz.Digraph): The graph to render
+
+    Returns:
+        bytes: The rendered PNG
+    """
+    key = graph.source
+    png_bytes = _render_cache.get(key)
+    if png_bytes is None:
+        png_bytes = graph.pipe(format='png')
+        if len(_render_cache) >= _RENDER_CACHE_MAX:
+            _render_cache.clear()
+        _render_cache[key] = png_bytes
+    return png_bytes
+
+
 def save_graph_to_file(graph, filename, view=False):
     """
     Save the graph to a file.
 
+    The graph is piped through dot directly and the PNG bytes are written
+    in one call, which skips the intermediate DOT source file that
+    render() creates (and then deletes again with cleanup=True).
+
     Args:
         graph (graphviz.Digraph): The graph to save
         filename (str): The filename (without extension)
@@ -119,4 +267,47 @@ def save_graph_to_file(graph, filename, view=False):
     Returns:
         str: The path to the saved file
     """
-    return graph.render(filename, cleanup=True, view=view)
\ No newline at end of file
+    output_path = f"{filename}.png"
+    png_bytes = _pipe_png(graph)
+    with open(output_path, 'wb') as f:
+        f.write(png_bytes)
+
+    if view:
+        import webbrowser
+        webbrowser.open(output_path)
+
+    return output_path
+
+
+def _save_one(pair):
+    """
+    Worker for save_graphs_to_files: render one (graph, filename) pair.
+
+    Args:
+        pair (tuple): A (graph, filename) pair as taken by save_graph_to_file
+
+    Returns:
+        str: The path to the saved file
+    """
+    graph, filename = pair
+    return save_graph_to_file(graph, filename)
+
+
+def save_graphs_to_files(graphs_and_filenames, max_workers=4):
+    """
+    Save several graphs concurrently.
+
+    Each render blocks on a dot subprocess, so a batch of graphs spends
+    most of its time waiting rather than computing. Dispatching the saves
+    through a thread pool lets several dot processes run at once; threads
+    are enough here because the work is subprocess-bound, not CPU-bound.
+
+    Args:
+        graphs_and_filenames (list): (graph, filename) pairs, filenames without extension
+        max_workers (int, optional): Number of concurrent renders
+
+    Returns:
+        list: The paths to the saved files, in input order
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_save_one, graphs_and_filenames))
\ No newline at end of file
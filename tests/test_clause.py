@@ -12,9 +12,8 @@ class TestClause(unittest.TestCase):
     def test_initialize_clause(self):
         """Test basic initialization of a clause."""
         clause = Clause(['a', 'b'], 'c')
-        self.assertEqual(clause.premise_literals, ['a', 'b'])
+        self.assertEqual(clause.premise_literals, ('a', 'b'))
         self.assertEqual(clause.conclusion_literal, 'c')
-        self.assertEqual(clause.known_count, 0)
 
     def test_is_fact(self):
         """Test the is_fact property."""
@@ -23,12 +22,18 @@ class TestClause(unittest.TestCase):
         self.assertTrue(fact_clause.is_fact)
         self.assertFalse(non_fact_clause.is_fact)
 
-    def test_increment_known_count(self):
-        """Test incrementing the known count of premises."""
-        clause = Clause(['a', 'b', 'c'], 'd')
-        self.assertFalse(clause.increment_known_count())  # 1/3
-        self.assertFalse(clause.increment_known_count())  # 2/3
-        self.assertTrue(clause.increment_known_count())  # 3/3
+    def test_premise_set(self):
+        """Test the frozenset view of premises and subset checks."""
+        clause = Clause(['a', 'b'], 'c')
+        self.assertEqual(clause.premise_set, frozenset({'a', 'b'}))
+        self.assertTrue(clause.is_satisfied_by({'a', 'b', 'x'}))
+        self.assertFalse(clause.is_satisfied_by({'a'}))
+
+    def test_equality_and_hash(self):
+        """Test that clauses compare and hash by logical content."""
+        self.assertEqual(Clause(['a', 'b'], 'c'), Clause(['b', 'a'], 'c'))
+        self.assertNotEqual(Clause(['a'], 'c'), Clause(['a'], 'd'))
+        self.assertEqual(hash(Clause(['a', 'b'], 'c')), hash(Clause(['b', 'a'], 'c')))
 
     def test_str_representation(self):
         """Test string representation of clauses."""
@@ -40,20 +45,26 @@ class TestClause(unittest.TestCase):
     def test_from_string_fact(self):
         """Test parsing a fact from a string."""
         clause = Clause.from_string("a")
-        self.assertEqual(clause.premise_literals, [])
+        self.assertEqual(clause.premise_literals, ())
         self.assertEqual(clause.conclusion_literal, "a")
         self.assertTrue(clause.is_fact)
 
     def test_from_string_simple_implication(self):
         """Test parsing a simple implication from a string."""
         clause = Clause.from_string("-a b")
-        self.assertEqual(clause.premise_literals, ["a"])
+        self.assertEqual(clause.premise_literals, ('a',))
         self.assertEqual(clause.conclusion_literal, "b")
 
     def test_from_string_complex_implication(self):
         """Test parsing a complex implication from a string."""
         clause = Clause.from_string("-a -b -c d")
-        self.assertEqual(clause.premise_literals, ["a", "b", "c"])
+        self.assertEqual(clause.premise_literals, ('a', 'b', 'c'))
+        self.assertEqual(clause.conclusion_literal, "d")
+
+    def test_from_string_conclusion_first(self):
+        """Test parsing a conclusion-first line, as the data files use."""
+        clause = Clause.from_string("d -a -b")
+        self.assertEqual(clause.premise_literals, ('a', 'b'))
         self.assertEqual(clause.conclusion_literal, "d")
 
     def test_from_string_invalid_no_conclusion(self):
@@ -65,9 +76,8 @@ class TestClause(unittest.TestCase):
         """Test the repr representation."""
         clause = Clause(['a', 'b'], 'c')
         repr_str = repr(clause)
-        self.assertIn("premise=['a', 'b']", repr_str)
+        self.assertIn("premise=('a', 'b')", repr_str)
         self.assertIn("conclusion=c", repr_str)
-        self.assertIn("known_count=0", repr_str)
 
 
 if __name__ == '__main__':
@@ -5,7 +5,12 @@ Unit tests for the forward_chaining module.
 import unittest
 from src.knowledge_base import KnowledgeBase
 from src.clause import Clause
-from src.forward_chaining import forward_chaining, forward_chaining_with_trace
+from src.forward_chaining import (
+    forward_chaining,
+    forward_chaining_parallel,
+    forward_chaining_semi_naive,
+    forward_chaining_with_trace,
+)
 
 
 class TestForwardChaining(unittest.TestCase):
@@ -90,6 +95,40 @@ class TestForwardChaining(unittest.TestCase):
         self.assertIn('c', order)
         self.assertIn('d', order)
 
+    def test_forward_chaining_semi_naive(self):
+        """Test the semi-naive (round-based) variant of forward chaining."""
+        # Entailed queries agree with the agenda-based version
+        result_c, order_c = forward_chaining_semi_naive(self.kb, 'c')
+        self.assertTrue(result_c)
+        self.assertEqual(order_c[-1], 'c')
+        # Rounds may infer extra symbols alongside the query (here 'd')
+        self.assertTrue({'a', 'b', 'c'}.issubset(set(order_c)))
+
+        # Non-entailed queries infer everything and return False
+        result_e, order_e = forward_chaining_semi_naive(self.kb, 'e')
+        self.assertFalse(result_e)
+        self.assertEqual(set(order_e), {'a', 'b', 'c', 'd'})
+
+    def test_forward_chaining_parallel(self):
+        """Test the multi-threaded variant of forward chaining."""
+        # Small knowledge bases fall back to the semi-naive variant
+        result, order = forward_chaining_parallel(self.kb, 'c')
+        self.assertTrue(result)
+        self.assertEqual(order[-1], 'c')
+
+        # A long chain large enough to take the threaded path
+        kb = KnowledgeBase()
+        kb.add_clause(Clause([], 's0'))
+        for i in range(10001):
+            kb.add_clause(Clause([f's{i}'], f's{i + 1}'))
+
+        result, order = forward_chaining_parallel(kb, 's10001')
+        self.assertTrue(result)
+        self.assertEqual(order[-1], 's10001')
+
+        result, _ = forward_chaining_parallel(kb, 'missing')
+        self.assertFalse(result)
+
     def test_forward_chaining_with_trace(self):
         """Test the detailed tracing version of forward chaining."""
         result, path, trace = forward_chaining_with_trace(self.kb, 'c')
@@ -35,6 +35,19 @@ class TestKnowledgeBase(unittest.TestCase):
         self.assertEqual(len(self.kb.get_clauses_with_premise('b')), 1)
         self.assertEqual(len(self.kb.get_clauses_with_premise('c')), 0)
 
+    def test_add_clause_ignores_duplicates(self):
+        """Test that re-adding an existing clause is a no-op."""
+        self.kb.add_clause(Clause(['a'], 'b'))  # already present
+        self.kb.add_clause(Clause(['b', 'a'], 'c'))  # same clause, premises reordered
+
+        self.assertEqual(len(self.kb.clauses), 3)
+        self.assertEqual(len(self.kb.get_clauses_with_premise('a')), 2)
+
+        # Duplicate lines in bulk-loaded text are dropped too
+        new_kb = KnowledgeBase()
+        new_kb.load_from_text("a\n-a b\na\n-a b\n")
+        self.assertEqual(len(new_kb.clauses), 2)
+
     def test_get_facts(self):
         """Test retrieving facts from the knowledge base."""
         facts = self.kb.get_facts()
@@ -63,6 +76,19 @@ class TestKnowledgeBase(unittest.TestCase):
         z_clauses = self.kb.get_clauses_with_premise('z')
         self.assertEqual(len(z_clauses), 0)
 
+    def test_get_clauses_with_conclusion(self):
+        """Test retrieving clauses by conclusion."""
+        # 'b' is concluded by one clause, 'a' only by its fact clause
+        self.assertEqual(len(self.kb.get_clauses_with_conclusion('b')), 1)
+        self.assertEqual(len(self.kb.get_clauses_with_conclusion('a')), 1)
+
+        # Another way to derive 'c'
+        self.kb.add_clause(Clause(['b'], 'c'))
+        self.assertEqual(len(self.kb.get_clauses_with_conclusion('c')), 2)
+
+        # Unknown symbol should return empty list
+        self.assertEqual(len(self.kb.get_clauses_with_conclusion('z')), 0)
+
     def test_load_from_file(self):
         """Test loading clauses from a file."""
         # Create a temporary file with test content
@@ -88,6 +114,67 @@ class TestKnowledgeBase(unittest.TestCase):
             # Clean up the temporary file
             os.unlink(tmp_name)
 
+    def test_load_from_text(self):
+        """Test bulk parsing of clauses from a string."""
+        new_kb = KnowledgeBase()
+        new_kb.load_from_text("a\n-a b\n\n-a -b c\n")
+
+        self.assertEqual(len(new_kb.clauses), 3)
+        self.assertEqual(new_kb.get_facts(), {'a'})
+        self.assertEqual(len(new_kb.get_clauses_with_premise('a')), 2)
+
+        # A line without a conclusion is rejected
+        with self.assertRaises(ValueError):
+            KnowledgeBase().load_from_text("-a -b\n")
+
+    def test_load_from_lines(self):
+        """Test loading from an in-memory iterable of lines."""
+        new_kb = KnowledgeBase()
+        new_kb.load_from_lines(['a', '-a b', '-a -b c'])
+
+        self.assertEqual(len(new_kb.clauses), 3)
+        self.assertEqual(new_kb.get_facts(), {'a'})
+
+    def test_load_from_file_fast(self):
+        """Test the bulk-loading path produces the same knowledge base."""
+        # Includes a conclusion-first line, as the data files use
+        temp_content = "a\n-a b\nc -a -b\n"
+        with tempfile.NamedTemporaryFile(mode='w', delete=False) as tmp:
+            tmp.write(temp_content)
+            tmp_name = tmp.name
+
+        try:
+            new_kb = KnowledgeBase()
+            new_kb.load_from_file_fast(tmp_name)
+
+            # Same clauses, facts, and premise index as the per-line loader
+            self.assertEqual(len(new_kb.clauses), 3)
+            self.assertEqual(new_kb.get_facts(), {'a'})
+            self.assertEqual(len(new_kb.get_clauses_with_premise('a')), 2)
+            self.assertEqual(len(new_kb.get_clauses_with_premise('b')), 1)
+        finally:
+            os.unlink(tmp_name)
+
+    def test_bitmask_step(self):
+        """Test the bitmask fast path derives the closure by fixpoint."""
+        mask = self.kb.get_facts_mask()
+        while True:
+            new_mask = self.kb.step(mask)
+            if new_mask == mask:
+                break
+            mask = new_mask
+
+        # a, b, and c are all derivable; their bits must be set
+        for symbol in ('a', 'b', 'c'):
+            self.assertTrue((mask >> self.kb.get_symbol_id(symbol)) & 1)
+
+        # Beyond 64 symbols the masks no longer fit a machine word
+        big_kb = KnowledgeBase()
+        for i in range(65):
+            big_kb.add_clause(Clause([], f's{i}'))
+        with self.assertRaises(ValueError):
+            big_kb.get_facts_mask()
+
     def test_get_all_symbols(self):
         """Test retrieving all symbols in the knowledge base."""
         symbols = self.kb.get_all_symbols()
@@ -7,7 +7,13 @@ import os
 import tempfile
 from src.knowledge_base import KnowledgeBase
 from src.clause import Clause
-from src.visualizer import create_knowledge_graph, highlight_inference_path, save_graph_to_file
+from src.visualizer import (
+    create_knowledge_graph,
+    create_knowledge_graph_source,
+    highlight_inference_path,
+    save_graph_to_file,
+    save_graphs_to_files,
+)
 
 
 class TestVisualizer(unittest.TestCase):
@@ -56,6 +62,18 @@ class TestVisualizer(unittest.TestCase):
         self.assertIn('a [', body_str)
         self.assertIn('fillcolor="#', body_str)  # Colored nodes
 
+    def test_create_knowledge_graph_source(self):
+        """Test creating the graph as a single-buffer Source."""
+        source = create_knowledge_graph_source(self.kb, self.inference_path)
+
+        self.assertEqual(source.format, 'png')
+
+        # The DOT source should contain the same nodes and edges as the
+        # Digraph-based builder
+        self.assertIn('a [', source.source)
+        self.assertIn(' -> ', source.source)
+        self.assertIn('fillcolor="#', source.source)
+
     def test_highlight_inference_path(self):
         """Test highlighting an inference path in an existing graph."""
         original_graph = create_knowledge_graph(self.kb)
@@ -71,6 +89,37 @@ class TestVisualizer(unittest.TestCase):
         self.assertNotEqual(original_body, highlighted_body)
         self.assertIn('fillcolor="#', highlighted_body)
 
+    def test_highlight_inference_path_quoted_symbols(self):
+        """Test highlighting symbols whose DOT names need quoting."""
+        kb = KnowledgeBase()
+        kb.add_clause(Clause([], 'foo-bar'))
+        kb.add_clause(Clause(['foo-bar'], 'baz'))
+
+        graph = create_knowledge_graph(kb)
+        highlighted = highlight_inference_path(graph, ['foo-bar', 'baz'])
+
+        highlighted_body = '\n'.join(highlighted.body)
+        self.assertIn('"foo-bar" [label="foo-bar" style=filled fillcolor="#', highlighted_body)
+        self.assertIn('baz [label=baz style=filled fillcolor="#', highlighted_body)
+
+    def test_highlight_inference_path_keyword_symbols(self):
+        """Test that DOT keyword symbols don't clobber attribute lines."""
+        kb = KnowledgeBase()
+        kb.add_clause(Clause([], 'node'))
+        kb.add_clause(Clause(['node'], 'graph'))
+
+        graph = create_knowledge_graph(kb)
+        highlighted = highlight_inference_path(graph, ['node', 'graph'])
+
+        # The default-attribute statements must survive untouched
+        highlighted_body = '\n'.join(highlighted.body)
+        self.assertIn('graph [rankdir=BT', highlighted_body)
+        self.assertIn('node [fillcolor=lightgray', highlighted_body)
+
+        # The keyword-named symbols themselves are quoted and highlighted
+        self.assertIn('"node" [label="node" style=filled fillcolor="#', highlighted_body)
+        self.assertIn('"graph" [label="graph" style=filled fillcolor="#', highlighted_body)
+
     def test_save_graph_to_file(self):
         """Test saving a graph to a file."""
         graph = create_knowledge_graph(self.kb)
@@ -86,6 +135,23 @@ class TestVisualizer(unittest.TestCase):
             self.assertTrue(os.path.exists(f"{output_path}.png"))
             self.assertEqual(result_path, f"{output_path}.png")
 
+    def test_save_graphs_to_files(self):
+        """Test saving several graphs concurrently."""
+        graph = create_knowledge_graph(self.kb)
+        highlighted = highlight_inference_path(graph, self.inference_path)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pairs = [
+                (graph, os.path.join(tmp_dir, 'plain')),
+                (highlighted, os.path.join(tmp_dir, 'highlighted')),
+            ]
+
+            result_paths = save_graphs_to_files(pairs)
+
+            self.assertEqual(result_paths, [f"{path}.png" for _, path in pairs])
+            for path in result_paths:
+                self.assertTrue(os.path.exists(path))
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file